@@ -3,6 +3,7 @@ import networkx as nx
 import conda_build.api
 from compute_build_graph import construct_graph
 import argparse
+import functools
 import os
 from collections import OrderedDict
 import sys
@@ -14,7 +15,13 @@ try:
 except ImportError:
     from yaml import BaseLoader, load
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
+@functools.lru_cache(maxsize=None)
 def get_host_platform():
     from sys import platform
     if platform == "linux" or platform == "linux2":
@@ -30,8 +37,14 @@ def get_config_name(arch):
     return os.environ.get("CONFIG", "{}{}".format(platform, arch))
 
 
-def build_all(recipes_dir, arch):
-    folders = list(filter(lambda d: os.path.isdir(os.path.join(recipes_dir, d)), os.listdir(recipes_dir)))
+def get_recipe_folders(recipes_dir):
+    with os.scandir(recipes_dir) as it:
+        return [entry.name for entry in it if entry.is_dir()]
+
+
+def build_all(recipes_dir, arch, folders=None):
+    if folders is None:
+        folders = get_recipe_folders(recipes_dir)
     if not folders:
         print("Found no recipes to build")
         return
@@ -42,28 +55,23 @@ def build_all(recipes_dir, arch):
 
     found_cuda = False
     found_centos7 = False
+    deployment_version = (0, 0)
+    sdk_version = (0, 0)
+    channel_urls = None
     for folder in folders:
         meta_yaml = os.path.join(recipes_dir, folder, "meta.yaml")
         if os.path.exists(meta_yaml):
             with(open(meta_yaml, "r", encoding="utf-8")) as f:
-                text = ''.join(f.readlines())
+                text = f.read()
                 if 'cuda' in text:
                     found_cuda = True
                 if 'sysroot_linux-64' in text:
                     found_centos7 = True
-    if found_cuda:
-        print('##vso[task.setvariable variable=NEED_CUDA;isOutput=true]1')
-    if found_centos7:
-        os.environ["DEFAULT_LINUX_VERSION"] = "cos7"
 
-    deployment_version = (0, 0)
-    sdk_version = (0, 0)
-    channel_urls = None
-    for folder in folders:
         cbc = os.path.join(recipes_dir, folder, "conda_build_config.yaml")
         if os.path.exists(cbc):
             with open(cbc, "r") as f:
-                text = ''.join(f.readlines())
+                text = f.read()
             if platform == 'osx' and (
                     'MACOSX_DEPLOYMENT_TARGET' in text or
                     'MACOSX_SDK_VERSION' in text):
@@ -88,11 +96,16 @@ def build_all(recipes_dir, arch):
             elif channel_urls != new_channel_urls:
                 raise ValueError(f'Detected different channel_sources in the recipes: {channel_urls} vs. {new_channel_urls}. Consider submitting them in separate PRs')
 
+    if found_cuda:
+        print('##vso[task.setvariable variable=NEED_CUDA;isOutput=true]1')
+    if found_centos7:
+        os.environ["DEFAULT_LINUX_VERSION"] = "cos7"
+
     if channel_urls is None:
         channel_urls = ['local', 'conda-forge']
 
     with open(variant_config_file, 'r') as f:
-        variant_text = ''.join(f.readlines())
+        variant_text = f.read()
 
     if deployment_version != (0, 0):
         deployment_version = '.'.join([str(x) for x in deployment_version])
@@ -175,26 +188,33 @@ def build_folders(recipes_dir, folders, arch, channel_urls):
 
 
 def check_recipes_in_correct_dir(root_dir, correct_dir):
-    from pathlib import Path
-    for path in Path(root_dir).rglob('meta.yaml'):
-        path = path.absolute().relative_to(root_dir)
-        if path.parts[0] == 'build_artifacts':
-            # ignore pkg_cache in build_artifacts
-            continue
-        if path.parts[0] != correct_dir and path.parts[0] != "broken-recipes":
-            raise RuntimeError(f"recipe {path.parts} in wrong directory")
-        if len(path.parts) != 3:
-            raise RuntimeError(f"recipe {path.parts} in wrong directory")
-
-
-def read_mambabuild(recipes_dir):
-    folders = os.listdir(recipes_dir)
+    stack = [root_dir]
+    while stack:
+        dirpath = stack.pop()
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    # ignore pkg_cache in build_artifacts, and don't descend into .git
+                    if dirpath == root_dir and entry.name in ('build_artifacts', '.git'):
+                        continue
+                    stack.append(entry.path)
+                elif entry.name == 'meta.yaml':
+                    parts = tuple(os.path.relpath(entry.path, root_dir).split(os.sep))
+                    if parts[0] != correct_dir and parts[0] != "broken-recipes":
+                        raise RuntimeError(f"recipe {parts} in wrong directory")
+                    if len(parts) != 3:
+                        raise RuntimeError(f"recipe {parts} in wrong directory")
+
+
+def read_mambabuild(recipes_dir, folders=None):
+    if folders is None:
+        folders = get_recipe_folders(recipes_dir)
     use_it = True
     for folder in folders:
         cf = os.path.join(recipes_dir, folder, "conda-forge.yml")
         if os.path.exists(cf):
             with open(cf, "r") as f:
-                cfy = yaml.safe_load(f.read())
+                cfy = yaml.load(f, Loader=SafeLoader)
             use_it = use_it and cfy.get("build_with_mambabuild", True)
     return use_it
 
@@ -211,8 +231,10 @@ if __name__ == "__main__":
     args = parser.parse_args()
     root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     check_recipes_in_correct_dir(root_dir, "recipes")
-    use_mamba = read_mambabuild(os.path.join(root_dir, "recipes"))
+    recipes_dir = os.path.join(root_dir, "recipes")
+    folders = get_recipe_folders(recipes_dir)
+    use_mamba = read_mambabuild(recipes_dir, folders)
     if use_mamba:
       use_mambabuild()
       subprocess.run("conda clean --all --yes", shell=True, check=True)
-    build_all(os.path.join(root_dir, "recipes"), args.arch)
+    build_all(recipes_dir, args.arch, folders)
@@ -31,6 +31,7 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 from __future__ import print_function, division
 
+import functools
 import logging
 import os
 import pkg_resources
@@ -287,13 +288,17 @@ def add_intradependencies(graph):
 
         test_requires = m.meta.get('test', {}).get('requires', [])
 
-        log.info("node: {}".format(node))
-        log.info("   build: {}".format(m.ms_depends('build')))
-        log.info("   host: {}".format(m.ms_depends('host')))
-        log.info("   run: {}".format(m.ms_depends('run')))
-        log.info("   test: {}".format(test_requires))
+        build_deps = m.ms_depends('build')
+        host_deps = m.ms_depends('host')
+        run_deps = m.ms_depends('run')
 
-        deps = set(m.ms_depends('build') + m.ms_depends('host') + m.ms_depends('run') +
+        log.info("node: %s", node)
+        log.info("   build: %s", build_deps)
+        log.info("   host: %s", host_deps)
+        log.info("   run: %s", run_deps)
+        log.info("   test: %s", test_requires)
+
+        deps = set(build_deps + host_deps + run_deps +
                    [conda_interface.MatchSpec(dep) for dep in test_requires or []])
 
         for dep in deps:
@@ -404,8 +409,18 @@ def construct_graph(recipes_dir, worker, run, conda_resolve, folders=(),
     return graph
 
 
+@functools.lru_cache(maxsize=None)
+def _any_hash_re(hash_length):
+    return re.compile('any(?:h[0-9a-f]{%d})?' % hash_length)
+
+
+@functools.lru_cache(maxsize=256)
+def _packagename_re(name):
+    return re.compile(r'%s(?:\-[0-9]+[\.0-9\_\-a-zA-Z]*)?$' % name)
+
+
 def _fix_any(value, config):
-    value = re.sub('any(?:h[0-9a-f]{%d})?' % config.hash_length, '', value)
+    value = _any_hash_re(config.hash_length).sub('', value)
     return value
 
 
@@ -416,23 +431,22 @@ def _installable(name, version, build_string, config, conda_resolve):
                                              _fix_any(build_string, config)]))
     installable = conda_resolve.find_matches(ms)
     if not installable:
-            log.warn("Dependency {name}, version {ver} is not installable from your "
-                     "channels: {channels} with subdir {subdir}.  Seeing if we can build it..."
-                     .format(name=name, ver=version, channels=config.channel_urls,
-                             subdir=config.host_subdir))
+            log.warning("Dependency %s, version %s is not installable from your "
+                        "channels: %s with subdir %s.  Seeing if we can build it...",
+                        name, version, config.channel_urls, config.host_subdir)
     return installable
 
 
 def _buildable(name, version, recipes_dir, worker, config, finalize):
     """Does the recipe that we have available produce the package we need?"""
-    possible_dirs = os.listdir(recipes_dir)
-    packagename_re = re.compile(r'%s(?:\-[0-9]+[\.0-9\_\-a-zA-Z]*)?$' % name)
-    likely_dirs = (dirname for dirname in possible_dirs if
-                    (os.path.isdir(os.path.join(recipes_dir, dirname)) and
-                    packagename_re.match(dirname)))
-    metadata_tuples = [m for path in likely_dirs
+    packagename_re = _packagename_re(name)
+    with os.scandir(recipes_dir) as it:
+        likely_dirs = [entry.name for entry in it if
+                       entry.is_dir() and packagename_re.match(entry.name)]
+    # lazily render, so that we stop at the first recipe that provides a match
+    metadata_tuples = (m for path in likely_dirs
                         for (m, _, _) in _get_or_render_metadata(os.path.join(recipes_dir,
-                                                                 path), worker, finalize=finalize)]
+                                                                 path), worker, finalize=finalize))
 
     # this is our target match
     ms = conda_interface.MatchSpec(" ".join([name, _fix_any(version, config)]))
@@ -524,9 +538,9 @@ def expand_run(graph, conda_resolve, worker, run, steps=0, max_downstream=5,
         #    We don't create this elsewhere because it is unnecessary and costly.
 
         # get all immediate subdirectories
-        other_top_dirs = [d for d in os.listdir(recipes_dir)
-                        if os.path.isdir(os.path.join(recipes_dir, d)) and
-                        not d.startswith('.')]
+        with os.scandir(recipes_dir) as it:
+            other_top_dirs = [entry.name for entry in it
+                              if entry.is_dir() and not entry.name.startswith('.')]
         recipe_dirs = []
         for recipe_dir in other_top_dirs:
             try:
@@ -11,6 +11,6 @@ for token in [
         gh = github.Github(os.environ[token])
         login = gh.get_user().login
     except Exception:
-        loging = "NOT FOUND"
+        login = "NOT FOUND"
 
     print("%s: %s" % (token, login))